@@ -7,13 +7,8 @@ import logging
 import sys
 from pathlib import Path
 
-# Import subcommand modules
-from commands.extract_emails import EmailExtractor
-from commands.extract_references import ReferenceExtractor
-
-from commands.pdf_converter import PDFConverter
-from commands.pdf_annotator import PDFAnnotator
-from commands.metadata_enricher import MetadataEnricher
+# Subcommand modules are imported in their branch of main() so each
+# invocation only loads the dependencies of the command being run
 
 
 def setup_logging(verbose=False):
@@ -27,7 +22,27 @@ def setup_logging(verbose=False):
         ]
     )
 
+def extract_emails_fast(input_dir, output_file):
+    """Run extract-emails with default options without building the parser"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    
+    try:
+        from commands.extract_emails import EmailExtractor
+        extractor = EmailExtractor()
+        extractor.extract(input_dir, output_file)
+        logger.info("Command completed successfully")
+        return 0
+    except Exception as e:
+        logger.error(f"Command failed: {e}")
+        return 1
+
 def main():
+    # Fast path for shell loops: plain 'extract-emails <input_dir> <output_file>'
+    args = sys.argv[1:]
+    if len(args) == 3 and args[0] == 'extract-emails' and not any(arg.startswith('-') for arg in args):
+        return extract_emails_fast(args[1], args[2])
+    
     parser = argparse.ArgumentParser(description='Academic Paper Processing Tool')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose logging')
     
@@ -37,11 +52,13 @@ def main():
     email_parser = subparsers.add_parser('extract-emails', help='Extract emails from text files')
     email_parser.add_argument('input_dir', help='Directory containing text files')
     email_parser.add_argument('output_file', help='Output file for extracted emails')
+    email_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
     
     # Extract references command
     ref_parser = subparsers.add_parser('extract-references', help='Extract references from text files')
     ref_parser.add_argument('input_dir', help='Directory containing text files')
     ref_parser.add_argument('output_file', help='Output file for references')
+    ref_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
     
 
     
@@ -50,11 +67,14 @@ def main():
     pdf_parser.add_argument('input_path', help='PDF file or directory')
     pdf_parser.add_argument('output_dir', help='Output directory for text files')
     pdf_parser.add_argument('--clean', action='store_true', help='Clean output directory first')
+    pdf_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count - 1)')
+    pdf_parser.add_argument('--jsonl', action='store_true', help='Write a folder into one corpus.jsonl instead of a .txt per PDF')
     
     # Make PDF highlightable command
     highlight_parser = subparsers.add_parser('make-highlightable', help='Make PDF highlightable')
     highlight_parser.add_argument('input_path', help='Input PDF file or directory')
     highlight_parser.add_argument('output_dir', help='Output directory')
+    highlight_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
     
     # Enrich metadata command
     enrich_parser = subparsers.add_parser('enrich-metadata', help='Enrich paper metadata')
@@ -62,7 +82,10 @@ def main():
     enrich_parser.add_argument('output_file', help='Output enriched file')
     enrich_parser.add_argument('--api-key', required=True, help='Google API key')
     enrich_parser.add_argument('--cse-id', required=True, help='Google CSE ID')
-    enrich_parser.add_argument('--delay', type=float, default=1.0, help='Delay between requests')
+    enrich_parser.add_argument('--delay', type=float, default=1.0, help='Minimum delay between requests to the same host')
+    enrich_parser.add_argument('--workers', type=int, default=8, help='Papers processed concurrently')
+    enrich_parser.add_argument('--no-cache', action='store_true', help='Do not read or write the lookup cache')
+    enrich_parser.add_argument('--mailto', help='Contact email sent to Crossref (uses its faster polite pool)')
     
 
     
@@ -77,26 +100,31 @@ def main():
     
     try:
         if args.command == 'extract-emails':
+            from commands.extract_emails import EmailExtractor
             extractor = EmailExtractor()
-            extractor.extract(args.input_dir, args.output_file)
+            extractor.extract(args.input_dir, args.output_file, workers=args.workers)
             
         elif args.command == 'extract-references':
+            from commands.extract_references import ReferenceExtractor
             extractor = ReferenceExtractor()
-            extractor.extract(args.input_dir, args.output_file)
+            extractor.extract(args.input_dir, args.output_file, workers=args.workers)
             
 
             
         elif args.command == 'convert-pdf':
+            from commands.pdf_converter import PDFConverter
             converter = PDFConverter()
-            converter.convert(args.input_path, args.output_dir, clean=args.clean)
+            converter.convert(args.input_path, args.output_dir, clean=args.clean, workers=args.workers, jsonl=args.jsonl)
             
         elif args.command == 'make-highlightable':
+            from commands.pdf_annotator import PDFAnnotator
             annotator = PDFAnnotator()
-            annotator.process(args.input_path, args.output_dir)
+            annotator.process(args.input_path, args.output_dir, workers=args.workers)
             
         elif args.command == 'enrich-metadata':
-            enricher = MetadataEnricher(args.api_key, args.cse_id)
-            num_papers = enricher.enrich(args.input_file, args.output_file, delay=args.delay)
+            from commands.metadata_enricher import MetadataEnricher
+            enricher = MetadataEnricher(args.api_key, args.cse_id, mailto=args.mailto)
+            num_papers = enricher.enrich(args.input_file, args.output_file, delay=args.delay, workers=args.workers, use_cache=not args.no_cache)
             logger.info(f"Enrichment completed for {num_papers} papers with automatic analysis")
             
 
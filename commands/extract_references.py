@@ -1,98 +1,259 @@
 import os
 import re
 import logging
+from functools import lru_cache, partial
 from pathlib import Path
 
-class ReferenceExtractor:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+try:
+    import re2 as _re  # optional: linear-time matching, no catastrophic backtracking
+except ImportError:
+    import re as _re
+
+try:
+    import hyperscan  # optional: one SIMD pass to locate DOI/URL candidates
+except ImportError:
+    hyperscan = None
+
+from commands.file_utils import iter_files, map_files
+
+# One group per kind of candidate, listed (like the *_RANKS below) in order
+# of preference: the best kind anywhere in the text wins, not the earliest hit
+DOI_RE = _re.compile(
+    r'(?i)DOI:\s*(?P<label>[^\s\n]+)'
+    r'|https://doi\.org/(?P<https>[^\s\n]+)'
+    r'|http://dx\.doi\.org/(?P<dx>[^\s\n]+)'
+    r'|doi\.org/(?P<link>[^\s\n]+)'
+    r'|(?P<bare>10\.\d{4,}/[^\s\n]+)'
+)
+DOI_RANKS = ('label', 'https', 'dx', 'link', 'bare')
+# The labels match without what follows them, so a URL later on the same
+# line is still seen as a URL; _label_value reads the labelled text
+URL_RE = _re.compile(
+    r'(?i)(?P<url>https?://[^\s\n]+)'
+    r'|(?P<www>www\.[^\s\n]+)'
+    r'|(?P<available>Available at:)'
+    r'|(?P<labelled>URL:)'
+)
+URL_RANKS = ('url', 'www', 'available', 'labelled')
+TRAIL_RE = _re.compile(r'[.,;:\s]*$')
+LEADNUM_RE = _re.compile(r'^\d+\s*')
+LEADNONALPHA_RE = _re.compile(r'^[^A-Za-z]*')
+AUTHOR_RE = _re.compile(r'[A-Z][a-z]+\s+[A-Z][a-z]*\s*,\s*[A-Z][a-z]+')
+# Over stripped lines: longer than 20 chars, not a 'Journal' line, leading
+# numbering removed (atomically, via the lookahead/backreference idiom),
+# not all capitals, and more than 10 chars left. Needs lookaround, so
+# this one always uses the standard re module.
+TITLE_RE = re.compile(
+    r'^(?!Journal)(?=.{21})(?=(\d*[^\S\n]*))\1(?![A-Z\s]*$)(?P<title>.{11,})$',
+    re.MULTILINE
+)
+YEAR_RE = _re.compile(r'(\d{4})')
+
+# Every DOI_RE / URL_RE match starts with one of these prefixes, so the
+# earliest prefix hit is a safe place to start the full regex search.
+DOI_PREFIXES = (rb'doi:', rb'(?:https?://(?:dx\.)?)?doi\.org/', rb'10\.\d{4,}/')
+URL_PREFIXES = (rb'https?://', rb'www\.', rb'available at:', rb'url:')
+DOI_HIT, URL_HIT = 0, 1
+
+def _build_prefilter():
+    """Compile all DOI/URL prefixes into one Hyperscan database, or None"""
+    if hyperscan is None:
+        return None
     
-    def extract_doi(self, text):
-        """Extract DOI from text"""
-        doi_patterns = [
-            r'DOI:\s*([^\s\n]+)',
-            r'doi:\s*([^\s\n]+)',
-            r'https://doi\.org/([^\s\n]+)',
-            r'http://dx\.doi\.org/([^\s\n]+)',
-            r'doi\.org/([^\s\n]+)',
-            r'10\.\d{4,}/[^\s\n]+',
-        ]
-        
-        for pattern in doi_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                doi = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                doi = re.sub(r'[.,;:\s]*$', '', doi)
-                return doi
-        return "Not found"
+    expressions = DOI_PREFIXES + URL_PREFIXES
+    ids = [DOI_HIT] * len(DOI_PREFIXES) + [URL_HIT] * len(URL_PREFIXES)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=list(expressions),
+        ids=ids,
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(expressions)
+    )
+    return db
+
+PREFILTER = _build_prefilter()
+
+def _candidate_starts(data):
+    """Return {DOI_HIT/URL_HIT: character offset} of the first candidate of each kind"""
+    first = {}
     
-    def extract_authors(self, text, filename):
-        """Extract authors from text using filename as guide"""
-        basename = Path(filename).stem
-        first_author = basename.split('_')[0] if '_' in basename else basename
-        
-        lines = text.split('\n')[:25]
-        
-        for line in lines:
+    def on_match(hit, start, end, flags, context):
+        if hit not in first or start < first[hit]:
+            first[hit] = start
+    
+    PREFILTER.scan(data, match_event_handler=on_match)
+    # Hits are byte offsets at ASCII characters; map them onto the decoded text
+    return {hit: len(data[:start].decode('utf-8', 'ignore')) for hit, start in first.items()}
+
+def _best_match(regex, ranks, text, pos, value):
+    """Return value(match) for the best-ranked match of regex in text from pos, or None
+    
+    Among matches of the same group the earliest wins. One finditer pass
+    replaces a search per pattern and stops at the first top-ranked match;
+    matches whose value is None are ignored.
+    """
+    best, best_rank = None, len(ranks)
+    for match in regex.finditer(text, pos):
+        rank = ranks.index(match.lastgroup)
+        if rank < best_rank:
+            found = value(match)
+            if found is not None:
+                best, best_rank = found, rank
+                if rank == 0:
+                    break
+    return best
+
+def _group_value(match):
+    return TRAIL_RE.sub('', match.group(match.lastgroup))
+
+def _label_value(match):
+    """Text after a URL_RE label: from the next non-space character to the end of that line"""
+    text = match.string
+    start = match.end()
+    while start < len(text) and text[start].isspace():
+        start += 1
+    if start == len(text):
+        # Only whitespace follows: like `\s*([^\n]+)`, that counts (as '') unless it is all newlines
+        return '' if text[match.end():].strip('\n') else None
+    stop = text.find('\n', start)
+    return TRAIL_RE.sub('', text[start:stop if stop >= 0 else len(text)])
+
+def _url_value(match):
+    if match.lastgroup in ('available', 'labelled'):
+        return _label_value(match)
+    return _group_value(match)
+
+def _head_lines(text, n):
+    """Return the first n lines of text without splitting the whole document"""
+    lines = []
+    start = 0
+    for _ in range(n):
+        end = text.find('\n', start)
+        if end < 0:
+            lines.append(text[start:])
+            break
+        lines.append(text[start:end])
+        start = end + 1
+    return lines
+
+def _authors_from_head(head, first_author):
+    """Find the author line in the head lines, guided by the filename's first author"""
+    first_author_lc = first_author.lower()
+    head_lc = '\n'.join(head).lower()
+    
+    # Lowercase the head once and skip the line scan if the name never appears
+    if first_author_lc in head_lc:
+        for line, line_lc in zip(head, head_lc.split('\n')):
             line_clean = line.strip()
-            if first_author.lower() in line_clean.lower() and len(line_clean) > 10:
-                clean_line = re.sub(r'^\d+\s*', '', line_clean)
-                clean_line = re.sub(r'^[^A-Za-z]*', '', clean_line)
+            if first_author_lc in line_lc and len(line_clean) > 10:
+                clean_line = LEADNUM_RE.sub('', line_clean)
+                clean_line = LEADNONALPHA_RE.sub('', clean_line)
                 
                 if any(word in clean_line.lower() for word in ['journal', 'department', 'university']):
                     continue
                     
                 if (',' in clean_line or ' and ' in clean_line) and len(clean_line) < 300:
                     return clean_line
-        
-        # Fallback pattern matching
-        for line in lines[:15]:
-            line_clean = line.strip()
-            if re.search(r'[A-Z][a-z]+\s+[A-Z][a-z]*\s*,\s*[A-Z][a-z]+', line_clean):
-                clean_line = re.sub(r'^\d+\s*', '', line_clean)
-                if 10 < len(clean_line) < 300:
-                    return clean_line
-        
-        return f"{first_author.title()} et al."
+    
+    # Fallback pattern matching
+    for line in head[:15]:
+        line_clean = line.strip()
+        if AUTHOR_RE.search(line_clean):
+            clean_line = LEADNUM_RE.sub('', line_clean)
+            if 10 < len(clean_line) < 300:
+                return clean_line
+    
+    return f"{first_author.title()} et al."
+
+def _title_from_head(head):
+    """Find the title among the head lines"""
+    match = TITLE_RE.search('\n'.join(line.strip() for line in head))
+    if match:
+        return match.group('title')
+    
+    return "Title not found"
+
+# Copies of the same paper share their first lines, so a single-process run
+# memoizes the head parsing. Keys hold whole heads, which for text with few
+# line breaks is most of a document, hence the small bound; worker processes
+# rarely see the same head twice and use the plain functions.
+_authors_from_head_cached = lru_cache(maxsize=256)(_authors_from_head)
+_title_from_head_cached = lru_cache(maxsize=256)(_title_from_head)
+
+def _process_ref_file(path, data, memoize=False):
+    """Worker entry point: return the formatted reference for one text file"""
+    content = data.decode('utf-8', 'ignore')
+    starts = _candidate_starts(data) if PREFILTER is not None else None
+    return ReferenceExtractor(memoize).extract_reference(content, os.path.basename(path), starts)
+
+class ReferenceExtractor:
+    def __init__(self, memoize=False):
+        self.logger = logging.getLogger(__name__)
+        # Cache author/title parsing per head; only worth it within one process
+        self.memoize = memoize
+    
+    def extract_doi(self, text, pos=0):
+        """Extract DOI from text, searching from pos (None means no candidate)"""
+        doi = _best_match(DOI_RE, DOI_RANKS, text, pos, _group_value) if pos is not None else None
+        return doi if doi is not None else "Not found"
+    
+    def extract_authors(self, text, filename):
+        """Extract authors from text using filename as guide"""
+        return self._extract_authors(_head_lines(text, 25), filename)
+    
+    def _extract_authors(self, head, filename):
+        """Extract authors from the first 25 document lines using filename as guide"""
+        basename = Path(filename).stem
+        first_author = basename.split('_')[0] if '_' in basename else basename
+        authors_from_head = _authors_from_head_cached if self.memoize else _authors_from_head
+        return authors_from_head(tuple(head[:25]), first_author)
     
     def extract_title(self, text):
         """Extract title from text"""
-        lines = text.split('\n')
-        
-        for line in lines[:15]:
-            line = line.strip()
-            if len(line) > 20 and not re.match(r'^\d+$', line) and not line.startswith('Journal'):
-                title = re.sub(r'^\d+\s*', '', line)
-                title = re.sub(r'^[A-Z\s]+$', '', title)
-                if len(title) > 10:
-                    return title
-        
-        return "Title not found"
+        return self._extract_title(_head_lines(text, 15))
+    
+    def _extract_title(self, head):
+        """Extract title from the first 15 document lines"""
+        title_from_head = _title_from_head_cached if self.memoize else _title_from_head
+        return title_from_head(tuple(head[:15]))
     
     def extract_year(self, filename):
         """Extract year from filename"""
-        match = re.search(r'(\d{4})', filename)
+        match = YEAR_RE.search(filename)
         return match.group(1) if match else "Year not found"
     
-    def extract_webpage(self, text):
-        """Extract webpage/URL from text"""
-        url_patterns = [
-            r'https?://[^\s\n]+',
-            r'www\.[^\s\n]+',
-            r'Available at:\s*([^\n]+)',
-            r'URL:\s*([^\n]+)',
-        ]
+    def extract_webpage(self, text, pos=0):
+        """Extract webpage/URL from text, searching from pos (None means no candidate)"""
+        url = _best_match(URL_RE, URL_RANKS, text, pos, _url_value) if pos is not None else None
+        return url if url is not None else "No webpage found"
+    
+    def extract_reference(self, content, filename, starts=None):
+        """Build the formatted reference entry for one document
+        
+        starts optionally maps DOI_HIT/URL_HIT to the offset of the first
+        candidate found by the prefilter; a missing key skips that search.
+        """
+        doi_pos, url_pos = (0, 0) if starts is None else (starts.get(DOI_HIT), starts.get(URL_HIT))
+        
+        # Split once; authors and title only look at the head
+        head = _head_lines(content, 25)
         
-        for pattern in url_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                url = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                url = re.sub(r'[.,;:\s]*$', '', url)
-                return url
+        # Extract information
+        doi = self.extract_doi(content, doi_pos)
+        authors = self._extract_authors(head, filename)
+        title = self._extract_title(head)
+        year = self.extract_year(filename)
+        webpage = self.extract_webpage(content, url_pos)
         
-        return "No webpage found"
+        # Format result
+        result = f"DOI: {doi}\n"
+        result += f"Authors: {authors}\n"
+        result += f"Title: {title}\n"
+        result += f"Year: {year}\n"
+        result += f"Webpage: {webpage}\n"
+        return result
     
-    def extract(self, input_dir, output_file):
+    def extract(self, input_dir, output_file, workers=None):
         """Extract references from all text files in directory"""
         input_path = Path(input_dir)
         output_path = Path(output_file)
@@ -106,42 +267,22 @@ class ReferenceExtractor:
         # Create output directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        results = []
+        files = iter_files(input_path, '.txt')
+        process = partial(_process_ref_file, memoize=True) if workers == 1 else _process_ref_file
         processed_files = 0
         
-        for txt_file in input_path.rglob('*.txt'):
-            try:
-                with open(txt_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Extract information
-                doi = self.extract_doi(content)
-                authors = self.extract_authors(content, txt_file.name)
-                title = self.extract_title(content)
-                year = self.extract_year(txt_file.name)
-                webpage = self.extract_webpage(content)
-                
-                # Format result
-                result = f"DOI: {doi}\n"
-                result += f"Authors: {authors}\n"
-                result += f"Title: {title}\n"
-                result += f"Year: {year}\n"
-                result += f"Webpage: {webpage}\n"
-                
-                results.append(result)
-                processed_files += 1
-                
-            except Exception as e:
-                self.logger.warning(f"Error processing {txt_file}: {e}")
-        
-        # Write to output file
+        # Write each reference as soon as it is ready
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
-                for i, result in enumerate(results):
-                    f.write(result)
-                    if i < len(results) - 1:
+                for txt_file, result, error in map_files(process, files, workers):
+                    if error:
+                        self.logger.warning(f"Error processing {txt_file}: {error}")
+                        continue
+                    if processed_files:
                         f.write("\n")
-        except Exception as e:
+                    f.write(result)
+                    processed_files += 1
+        except OSError as e:
             raise IOError(f"Failed to write output file: {e}")
         
         self.logger.info(f"Processed {processed_files} files")
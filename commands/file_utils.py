@@ -0,0 +1,104 @@
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+
+def iter_files(root, suffix, recursive=True, ignore_case=False):
+    """Yield paths (as str) of files below root whose name ends with suffix
+
+    Uses os.scandir so directory entries carry their type and no Path
+    object is built for entries that do not match. Directories that
+    cannot be read are skipped.
+    """
+    if ignore_case:
+        suffix = suffix.lower()
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except PermissionError:
+            continue  # unreadable directory: skip it, as Path.rglob does
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                    continue
+                name = entry.name.lower() if ignore_case else entry.name
+                if name.endswith(suffix) and entry.is_file():
+                    yield entry.path
+
+
+def read_bytes(path):
+    """Return the raw contents of a file"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@contextmanager
+def open_mapped(path):
+    """Map a file read-only; empty files give b'' since mmap rejects them"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Ask the kernel to read the whole file in one go instead of
+            # faulting pages in one by one during the scan (Linux/BSD only)
+            if hasattr(mmap, 'MADV_WILLNEED'):
+                mm.madvise(mmap.MADV_WILLNEED)
+            yield mm
+
+
+def read_ahead(paths, window=32, max_workers=8):
+    """Yield (path, future) pairs while up to `window` reads run ahead in threads"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append((path, executor.submit(read_bytes, path)))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def _apply(func, path, read):
+    """Run func(path, data) and return (path, result, error)"""
+    try:
+        return path, func(path, read()), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _apply_to_file(func, path):
+    return _apply(func, path, partial(read_bytes, path))
+
+
+def _apply_to_mapped_file(func, path):
+    try:
+        with open_mapped(path) as data:
+            return path, func(path, data), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def map_files(func, paths, workers=None, chunksize=16, mapped=False):
+    """Apply func(path, data) to each file and yield (path, result, error) in input order
+
+    func must be a module-level function so it can be pickled for the
+    worker processes. With workers=1 everything runs in the current
+    process and file reads are prefetched on background threads.
+    With mapped=True, worker processes pass a read-only mmap instead of
+    bytes; func must not keep references into it.
+    """
+    if workers == 1:
+        for path, future in read_ahead(paths):
+            yield _apply(func, path, future.result)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        apply = _apply_to_mapped_file if mapped else _apply_to_file
+        yield from executor.map(partial(apply, func), paths, chunksize=chunksize)
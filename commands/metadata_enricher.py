@@ -1,43 +1,268 @@
 import requests
 import re
+import html
+import json
 import time
+import sqlite3
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin, urlparse
 from bs4 import BeautifulSoup
-from datetime import datetime
+import soupsieve
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # optional: C-backed HTML parser, much faster DOM builds than html.parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    import orjson  # optional: parses API responses straight from bytes, several times faster
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+MAX_PAGE_BYTES = 256 * 1024
+GOOGLE_SEARCH_URL = 'https://www.googleapis.com/customsearch/v1'
+GOOGLE_SEARCH_INTERVAL = 0.1  # Custom Search JSON API allows 10 queries per second
+CROSSREF_WORKS_URL = 'https://api.crossref.org/works/'
+CROSSREF_INTERVAL = 0.1  # stay well inside Crossref's polite-pool limits
+# Highwire Press and Dublin Core tags most publishers put in <head>
+META_NAME_RE = re.compile(r'^(citation_author|citation_abstract|DC\.(creator|description))$', re.I)
+_AUTHOR_FMT_RE = re.compile(r'[A-Z][a-z]+.*[A-Z][a-z]+')
+_WS_RE = re.compile(r'\s+')
+# Crossref abstracts are JATS XML; drop the "Abstract" heading and all tags
+_JATS_RE = re.compile(r'<jats:title>.*?</jats:title>|<[^>]+>', re.S)
+_HTTP_STATUS_RE = re.compile(r'HTTP (\d{3})')
+_DOI_RE = re.compile(r'^10\.\d{4,9}/\S+$')
+# DOI and Title lines of a reference block; the last occurrence wins
+_FIELDS_RE = re.compile(r'^(?P<key>DOI|Title):(?P<val>.*)$', re.MULTILINE)
+
+# CSS selectors tried in order when a page has no usable meta tags
+AUTHOR_SELECTORS = [soupsieve.compile(selector) for selector in (
+    '.authors', '.author-list', '[class*="author"]',
+    '.citation-authors', '.contributors'
+)]
+ABSTRACT_SELECTORS = [soupsieve.compile(selector) for selector in (
+    '.abstract', '.article-abstract', '[id*="abstract"]',
+    '[class*="abstract"]', '.article-text', '.content'
+)]
+
+def is_valid_doi(doi):
+    """True if doi looks like a DOI (10.<registrant>/<suffix>); placeholders and ISBNs are not"""
+    return bool(doi) and _DOI_RE.match(doi.strip()) is not None
+
+class ThrottledSession(requests.Session):
+    """Session that spaces requests to the same host at least `delay` seconds apart
+    
+    At most `max_per_host` requests to one host are in flight at a time.
+    host_delays and host_limits override the spacing and the in-flight
+    limit for individual hosts (e.g. APIs with a published rate limit).
+    Safe to share between threads: each request takes its host's
+    semaphore, reserves the next free slot under a lock and then sleeps
+    until that slot.
+    """
+    def __init__(self, delay=0.0, max_per_host=2):
+        super().__init__()
+        self.delay = delay
+        self.host_delays = {}
+        self.max_per_host = max_per_host
+        self.host_limits = {}
+        self._next_slot = {}
+        self._host_semaphores = {}
+        self._slot_lock = threading.Lock()
+    
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).netloc
+        with self._host_semaphore(host):
+            self._wait_for_slot(host)
+            return super().request(method, url, *args, **kwargs)
+    
+    def _host_semaphore(self, host):
+        with self._slot_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._host_semaphores[host] = threading.BoundedSemaphore(
+                    self.host_limits.get(host, self.max_per_host))
+        return semaphore
+    
+    def _wait_for_slot(self, host):
+        delay = self.host_delays.get(host, self.delay)
+        if delay <= 0:
+            return
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+def create_session(delay=0.0):
+    """Build a keep-alive HTTP session with connection pooling, retries and per-host throttling"""
+    session = ThrottledSession(delay)
+    # 429 is retried after the server's Retry-After (urllib3 honours the header)
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+class EnrichmentCache:
+    """Persistent SQLite cache of lookups keyed by (kind, key), with expiry"""
+    def __init__(self, path, ttl=timedelta(days=90)):
+        self.ttl = ttl.total_seconds()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'kind TEXT, key TEXT, value TEXT, stored REAL, PRIMARY KEY (kind, key))'
+            )
+    
+    def get(self, kind, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, stored FROM cache WHERE kind = ? AND key = ?', (kind, key)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+    
+    def set(self, kind, key, value):
+        """Store a JSON-serializable value"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                (kind, key, json.dumps(value), time.time())
+            )
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
 
 class DOIResolver:
-    def __init__(self):
+    def __init__(self, session=None, cache=None):
+        self.session = session or create_session()
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
     def resolve(self, doi):
         """Try to resolve DOI to publisher page"""
-        if not doi or doi == "Not available" or "ISBN" in doi:
+        if not is_valid_doi(doi):
             return None, "No valid DOI"
-        
+        doi = doi.strip()
+        
+        key = doi.lower()
+        if self.cache:
+            cached = self.cache.get('doi', key)
+            if cached:
+                return cached[0], cached[1]
+        
+        resolved_url, status = self._resolve_remote(doi)
+        # Only successes are cached; failures are often transient
+        if self.cache and resolved_url:
+            self.cache.set('doi', key, [resolved_url, status])
+        return resolved_url, status
+    
+    def _resolve_remote(self, doi):
+        """Resolve DOI over HTTP"""
         try:
             doi_url = f"https://doi.org/{doi}"
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(doi_url, headers=headers, timeout=15, allow_redirects=True)
+            # Only the final URL matters, so don't download the publisher page
+            response = self.session.head(doi_url, timeout=10, allow_redirects=True)
+            
+            if response.status_code in (405, 501):
+                # Some publishers reject HEAD; stream a GET and close before reading the body
+                response = self.session.get(doi_url, timeout=15, allow_redirects=True, stream=True)
+                response.close()
             
-            if response.status_code == 200:
+            # Paywalled (402) or bot-blocked (403) pages still tell us where the DOI points
+            if response.status_code == 200 or (response.status_code in (402, 403) and response.history):
                 return response.url, "DOI resolved successfully"
             else:
                 return None, f"DOI resolution failed: HTTP {response.status_code}"
         except Exception as e:
             return None, f"DOI resolution error: {str(e)}"
 
+class CrossrefResolver:
+    """Fetch canonical metadata for a DOI from the Crossref REST API"""
+    def __init__(self, session=None, cache=None, mailto=None):
+        self.session = session or create_session()
+        self.cache = cache
+        # With a contact address Crossref serves requests from its faster "polite" pool
+        self.mailto = mailto
+        if isinstance(self.session, ThrottledSession):
+            host = urlparse(CROSSREF_WORKS_URL).netloc
+            self.session.host_delays[host] = CROSSREF_INTERVAL
+            self.session.host_limits[host] = 3
+        self.logger = logging.getLogger(__name__)
+    
+    def fetch(self, doi):
+        """Return (abstract, authors, url) for a DOI; empty strings when unknown"""
+        key = doi.lower()
+        if self.cache:
+            cached = self.cache.get('crossref', key)
+            if cached:
+                return cached[0], cached[1], cached[2]
+        
+        abstract, authors, url = self._fetch_remote(doi)
+        if self.cache and (abstract or authors):
+            self.cache.set('crossref', key, [abstract, authors, url])
+        return abstract, authors, url
+    
+    def _fetch_remote(self, doi):
+        """Query the works endpoint"""
+        try:
+            params = {'mailto': self.mailto} if self.mailto else None
+            response = self.session.get(CROSSREF_WORKS_URL + quote(doi, safe='/'), params=params, timeout=10)
+            response.raise_for_status()
+            message = _json_loads(response.content).get('message', {})
+        except Exception as e:
+            self.logger.debug(f"Crossref lookup error for {doi}: {e}")
+            return "", "", ""
+        
+        names = []
+        for author in message.get('author', []):
+            name = ' '.join(part for part in (author.get('given'), author.get('family')) if part)
+            name = name or author.get('name', '')
+            if name:
+                names.append(name)
+        
+        abstract = _WS_RE.sub(' ', html.unescape(_JATS_RE.sub(' ', message.get('abstract', '')))).strip()
+        if len(abstract) > 500:
+            abstract = abstract[:500] + "..."
+        
+        url = message.get('resource', {}).get('primary', {}).get('URL') or message.get('URL', '')
+        return abstract, "; ".join(names), url
+
 class GoogleSearcher:
-    def __init__(self, api_key, cse_id):
+    def __init__(self, api_key, cse_id, session=None):
         self.api_key = api_key
         self.cse_id = cse_id
+        self.session = session or create_session()
+        # Fallback searches from concurrent papers may run at the API's own rate
+        # limit instead of the politeness delay meant for publisher sites
+        # (a plain requests.Session has no per-host throttling to adjust)
+        if isinstance(self.session, ThrottledSession):
+            host = urlparse(GOOGLE_SEARCH_URL).netloc
+            self.session.host_delays[host] = GOOGLE_SEARCH_INTERVAL
+            self.session.host_limits[host] = 10
         self.logger = logging.getLogger(__name__)
     
     def search(self, query, num_results=5):
         """Perform Google search using Custom Search JSON API"""
         try:
-            url = "https://www.googleapis.com/customsearch/v1"
+            url = GOOGLE_SEARCH_URL
             params = {
                 'key': self.api_key,
                 'cx': self.cse_id,
@@ -45,11 +270,11 @@ class GoogleSearcher:
                 'num': num_results
             }
             
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             
             results = []
-            data = response.json()
+            data = _json_loads(response.content)
             
             for item in data.get('items', []):
                 results.append({
@@ -64,23 +289,45 @@ class GoogleSearcher:
             return []
 
 class MetadataExtractor:
-    def __init__(self):
+    def __init__(self, session=None, cache=None):
+        self.session = session or create_session()
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
     def extract_from_url(self, url):
         """Extract metadata from a webpage"""
+        if self.cache:
+            cached = self.cache.get('page', url)
+            if cached:
+                return cached[0], cached[1]
+        
+        abstract, authors = self._fetch_metadata(url)
+        if self.cache and (abstract or authors):
+            self.cache.set('page', url, [abstract, authors])
+        return abstract, authors
+    
+    def _fetch_metadata(self, url):
+        """Download a webpage and extract its metadata"""
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Metadata sits in <head> and the top of <body>; don't download the rest
+            response = self.session.get(url, timeout=10, stream=True)
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and 'html' not in content_type.lower():
+                    raise ValueError(f"Not an HTML page: {content_type}")
+                content = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            finally:
+                response.close()
             
-            # Extract authors
-            authors = self._extract_authors(soup)
+            soup = BeautifulSoup(content, HTML_PARSER)
             
-            # Extract abstract
-            abstract = self._extract_abstract(soup)
+            # Prefer the publisher's meta tags; guess from page markup only for what they lack
+            abstract, authors = self._extract_meta(soup)
+            if not authors:
+                authors = self._extract_authors(soup)
+            if not abstract:
+                abstract = self._extract_abstract(soup)
             
             return abstract, authors
             
@@ -88,31 +335,41 @@ class MetadataExtractor:
             self.logger.debug(f"Metadata extraction error from {url}: {e}")
             return "", ""
     
+    def _extract_meta(self, soup):
+        """Extract abstract and authors from citation_* / DC.* meta tags"""
+        authors = []
+        abstract = ""
+        
+        for tag in soup.find_all('meta', attrs={'name': META_NAME_RE}):
+            content = (tag.get('content') or '').strip()
+            if not content:
+                continue
+            name = tag['name'].lower()
+            if name in ('citation_author', 'dc.creator'):
+                if content not in authors:
+                    authors.append(content)
+            elif not abstract:
+                abstract = content
+        
+        if len(abstract) > 500:
+            abstract = abstract[:500] + "..."
+        return abstract, "; ".join(authors)
+    
     def _extract_authors(self, soup):
         """Extract authors from BeautifulSoup object"""
-        author_selectors = [
-            '.authors', '.author-list', '[class*="author"]', 
-            '.citation-authors', '.contributors'
-        ]
-        
-        for selector in author_selectors:
-            element = soup.select_one(selector)
+        for selector in AUTHOR_SELECTORS:
+            element = selector.select_one(soup)
             if element:
                 text = element.get_text(strip=True)
                 if any(keyword in text.lower() for keyword in ['author', 'by ', 'et al']):
-                    authors_text = re.sub(r'\s+', ' ', text)
+                    authors_text = _WS_RE.sub(' ', text)
                     return authors_text
         return ""
     
     def _extract_abstract(self, soup):
         """Extract abstract from BeautifulSoup object"""
-        abstract_selectors = [
-            '.abstract', '.article-abstract', '[id*="abstract"]', 
-            '[class*="abstract"]', '.article-text', '.content'
-        ]
-        
-        for selector in abstract_selectors:
-            element = soup.select_one(selector)
+        for selector in ABSTRACT_SELECTORS:
+            element = selector.select_one(soup)
             if element:
                 text = element.get_text(strip=True)
                 if len(text) > 100:
@@ -120,15 +377,16 @@ class MetadataExtractor:
         return ""
 
 class ConfidenceCalculator:
+    BASE_SCORES = {
+        'crossref_api': 95,
+        'doi_direct': 90,
+        'google_search': 60,
+        'fallback': 30
+    }
+    
     def calculate(self, data_type, source_method, validation_results):
         """Calculate confidence score 0-100 for extracted data"""
-        base_scores = {
-            'doi_direct': 90,
-            'google_search': 60,
-            'fallback': 30
-        }
-        
-        score = base_scores.get(source_method, 30)
+        score = self.BASE_SCORES.get(source_method, 30)
         
         # Adjust based on validation
         if validation_results.get('format_valid', False):
@@ -139,10 +397,27 @@ class ConfidenceCalculator:
             score += 10
         
         return min(100, max(0, score))
+    
+    def calculate_pair(self, source_method, author_validation, abstract_validation):
+        """Return (author_score, abstract_score) for one source"""
+        return (self.calculate('authors', source_method, author_validation),
+                self.calculate('abstract', source_method, abstract_validation))
 
 class DataValidator:
     def validate(self, data, paper_title, data_type):
         """Validate extracted data and return validation results"""
+        return self._validate(data, self._title_words(paper_title), data_type)
+    
+    def validate_pair(self, authors, abstract, paper_title):
+        """Validate authors and abstract against one title; returns (author_results, abstract_results)"""
+        title_words = self._title_words(paper_title)
+        return (self._validate(authors, title_words, 'authors'),
+                self._validate(abstract, title_words, 'abstract'))
+    
+    def _title_words(self, paper_title):
+        return set(paper_title.casefold().split()) if paper_title else set()
+    
+    def _validate(self, data, title_words, data_type):
         results = {
             'format_valid': False,
             'content_relevant': False,
@@ -152,62 +427,81 @@ class DataValidator:
         if not data:
             return results
         
+        data_folded = data.casefold()
+        
         # Format validation
         if data_type == 'authors':
-            if re.search(r'[A-Z][a-z]+.*[A-Z][a-z]+', data) or 'et al' in data:
+            if _AUTHOR_FMT_RE.search(data) or 'et al' in data:
                 results['format_valid'] = True
         elif data_type == 'abstract':
-            if len(data) > 50 and any(word in data.lower() for word in ['study', 'research', 'analysis', 'method']):
+            if len(data) > 50 and any(word in data_folded for word in ['study', 'research', 'analysis', 'method']):
                 results['format_valid'] = True
         
         # Content relevance
-        if paper_title:
-            title_words = set(paper_title.lower().split())
-            data_words = set(data.lower().split())
-            if len(title_words.intersection(data_words)) > 0:
-                results['content_relevant'] = True
+        if not title_words.isdisjoint(data_folded.split()):
+            results['content_relevant'] = True
         
         return results
 
 class MetadataEnricher:
-    def __init__(self, api_key, cse_id):
-        self.doi_resolver = DOIResolver()
-        self.google_searcher = GoogleSearcher(api_key, cse_id)
-        self.metadata_extractor = MetadataExtractor()
+    def __init__(self, api_key, cse_id, mailto=None):
+        # One pooled session so repeated hosts reuse their connections
+        self.session = create_session()
+        self.crossref_resolver = CrossrefResolver(self.session, mailto=mailto)
+        self.doi_resolver = DOIResolver(self.session)
+        self.google_searcher = GoogleSearcher(api_key, cse_id, self.session)
+        self.metadata_extractor = MetadataExtractor(self.session)
         self.confidence_calculator = ConfidenceCalculator()
         self.data_validator = DataValidator()
         self.logger = logging.getLogger(__name__)
         self.results_log = []
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+    
+    def _count(self, *keys):
+        """Increment processing statistics (called from worker threads)"""
+        with self._stats_lock:
+            self.stats.update(keys)
     
-    def _log_result(self, message):
-        """Log message to both logger and internal results log"""
+    def _log_result(self, message, log=None):
+        """Log message to both logger and internal results log (or the given per-paper log)"""
         timestamp = datetime.now().strftime('%H:%M:%S')
         log_message = f"[{timestamp}] {message}"
-        self.results_log.append(log_message)
+        (self.results_log if log is None else log).append(log_message)
         self.logger.info(message)
     
-    def _process_paper_block(self, block):
+    def _enrich_block(self, index, block, total):
+        """Process one paper, then add its log lines to the results log as one group"""
+        log = []
+        self._count('papers')
+        self._log_result(f"\n[{index}/{total}] " + "="*50, log)
+        enriched_block = self._process_paper_block(block, log)
+        self.results_log.extend(log)
+        return enriched_block
+    
+    def _score(self, authors, abstract, title, source_method):
+        """Validate both fields once and return (author_confidence, abstract_confidence)
+        
+        A missing field scores 0, so it always triggers review.
+        """
+        author_validation, abstract_validation = self.data_validator.validate_pair(authors, abstract, title)
+        author_confidence, abstract_confidence = self.confidence_calculator.calculate_pair(
+            source_method, author_validation, abstract_validation)
+        return (author_confidence if authors else 0), (abstract_confidence if abstract else 0)
+    
+    def _process_paper_block(self, block, log=None):
         """Process one paper block with DOI-first approach"""
-        lines = block.strip().split('\n')
-        if not lines:
-            return block
-        
         # Extract DOI and Title
-        doi = None
-        title = None
-        
-        for line in lines:
-            if line.startswith('DOI:'):
-                doi = line[4:].strip()
-            elif line.startswith('Title:'):
-                title = line[6:].strip()
+        fields = {match.group('key'): match.group('val').strip() for match in _FIELDS_RE.finditer(block)}
+        doi = fields.get('DOI')
+        title = fields.get('Title')
         
         if not title:
-            self._log_result("ERROR: No title found, skipping paper")
+            self._log_result("ERROR: No title found, skipping paper", log)
             return block
         
-        self._log_result(f"Processing: {title[:60]}...")
-        self._log_result(f"DOI: {doi}")
+        self._log_result(f"Processing: {title[:60]}...", log)
+        self._log_result(f"DOI: {doi}", log)
         
         # Initialize result tracking
         result = {
@@ -222,64 +516,114 @@ class MetadataEnricher:
             'errors': []
         }
         
-        # Try DOI resolution first
-        if doi and doi != "Not available" and "ISBN" not in doi:
-            self._log_result("Attempting DOI resolution...")
+        # Placeholders like "Not found" are rejected here, before any request
+        has_doi = is_valid_doi(doi)
+        
+        # Try Crossref first: one small JSON request, no page scraping
+        if has_doi:
+            self._log_result("Attempting Crossref lookup...", log)
+            self._count('crossref_attempts')
+            abstract, authors, crossref_url = self.crossref_resolver.fetch(doi)
+            
+            if authors or abstract:
+                author_confidence, abstract_confidence = self._score(authors, abstract, title, 'crossref_api')
+                result.update({
+                    'authors': authors,
+                    'abstract': abstract,
+                    'webpage': crossref_url,
+                    'author_confidence': author_confidence,
+                    'abstract_confidence': abstract_confidence,
+                    'webpage_confidence': 95 if crossref_url else 0,
+                    'source_method': 'CROSSREF_API'
+                })
+                
+                self._log_result("Crossref metadata found", log)
+                self._count('crossref_successes')
+                self._log_result(f"Authors confidence: {result['author_confidence']}%", log)
+                self._log_result(f"Abstract confidence: {result['abstract_confidence']}%", log)
+        
+        # Then resolve the DOI and scrape the publisher page: for everything when
+        # Crossref had nothing, or for the abstract Crossref often lacks
+        if has_doi and not result['abstract']:
+            self._log_result("Attempting DOI resolution...", log)
+            self._count('doi_attempts')
             resolved_url, doi_status = self.doi_resolver.resolve(doi)
             
             if resolved_url:
-                self._log_result(f"DOI resolved to: {resolved_url}")
+                self._log_result(f"DOI resolved to: {resolved_url}", log)
+                self._count('doi_successes')
                 abstract, authors = self.metadata_extractor.extract_from_url(resolved_url)
                 
-                if authors or abstract:
+                if result['authors']:
+                    # Keep Crossref's authors; only the abstract comes from the page
+                    if abstract:
+                        _, abstract_confidence = self._score(result['authors'], abstract, title, 'doi_direct')
+                        result.update({
+                            'abstract': abstract,
+                            'webpage': result['webpage'] or resolved_url,
+                            'abstract_confidence': abstract_confidence,
+                            'webpage_confidence': 95,
+                            'source_method': 'CROSSREF_API+DOI_DIRECT'
+                        })
+                        self._log_result(f"Abstract confidence: {result['abstract_confidence']}%", log)
+                    else:
+                        self._log_result("No abstract found on DOI page", log)
+                elif authors or abstract:
                     # Validate and calculate confidence
-                    author_validation = self.data_validator.validate(authors, title, 'authors')
-                    abstract_validation = self.data_validator.validate(abstract, title, 'abstract')
-                    
+                    author_confidence, abstract_confidence = self._score(authors, abstract, title, 'doi_direct')
                     result.update({
                         'authors': authors,
                         'abstract': abstract,
                         'webpage': resolved_url,
-                        'author_confidence': self.confidence_calculator.calculate('authors', 'doi_direct', author_validation),
-                        'abstract_confidence': self.confidence_calculator.calculate('abstract', 'doi_direct', abstract_validation),
+                        'author_confidence': author_confidence,
+                        'abstract_confidence': abstract_confidence,
                         'webpage_confidence': 95,
                         'source_method': 'DOI_DIRECT'
                     })
                     
-                    self._log_result(f"Authors confidence: {result['author_confidence']}%")
-                    self._log_result(f"Abstract confidence: {result['abstract_confidence']}%")
+                    self._log_result(f"Authors confidence: {result['author_confidence']}%", log)
+                    self._log_result(f"Abstract confidence: {result['abstract_confidence']}%", log)
                 else:
-                    self._log_result("Failed to extract metadata from DOI page")
+                    self._log_result("Failed to extract metadata from DOI page", log)
                     result['errors'].append('DOI page metadata extraction failed')
             else:
-                self._log_result(f"DOI resolution failed: {doi_status}")
+                self._log_result(f"DOI resolution failed: {doi_status}", log)
+                http_status = _HTTP_STATUS_RE.search(doi_status)
+                self._count('doi_failures', f"http_{http_status.group(1)}" if http_status else 'http_none')
                 result['errors'].append(f'DOI resolution failed: {doi_status}')
         
+        # One confidence count per paper found through Crossref and/or the DOI page
+        if result['source_method']:
+            self._count(f"conf_{result['author_confidence']}", f"conf_{result['abstract_confidence']}")
+        
         # Fallback to Google search if DOI failed or no results
         if not result['authors'] and not result['abstract']:
-            self._log_result("Falling back to Google search...")
+            self._log_result("Falling back to Google search...", log)
+            self._count('fallback_attempts')
             search_results = self.google_searcher.search(f'"{title}"', num_results=3)
             
             if search_results:
                 for i, search_result in enumerate(search_results[:2]):
-                    self._log_result(f"Trying search result {i+1}: {search_result['title'][:50]}...")
+                    self._log_result(f"Trying search result {i+1}: {search_result['title'][:50]}...", log)
                     
                     abstract, authors = self.metadata_extractor.extract_from_url(search_result['link'])
                     if authors or abstract:
-                        validation = self.data_validator.validate(authors, title, 'authors')
+                        author_confidence, abstract_confidence = self._score(authors, abstract, title, 'google_search')
                         result.update({
                             'authors': authors,
                             'abstract': abstract,
                             'webpage': search_result['link'],
-                            'author_confidence': self.confidence_calculator.calculate('authors', 'google_search', validation),
-                            'abstract_confidence': self.confidence_calculator.calculate('abstract', 'google_search', validation),
+                            'author_confidence': author_confidence,
+                            'abstract_confidence': abstract_confidence,
                             'webpage_confidence': 50,
                             'source_method': 'GOOGLE_FALLBACK'
                         })
-                        self._log_result("Fallback extraction successful")
+                        self._log_result("Fallback extraction successful", log)
+                        self._count('fallback_successes')
                         break
             else:
-                self._log_result("No search results found")
+                self._log_result("No search results found", log)
+                self._count('no_results')
                 result['errors'].append('No search results found')
         
         # Determine if needs human review
@@ -289,38 +633,45 @@ class MetadataEnricher:
         
         if low_confidence or result['errors']:
             result['needs_review'] = True
-            self._log_result("[REVIEW NEEDED] Low confidence or errors detected")
+            self._log_result("[REVIEW NEEDED] Low confidence or errors detected", log)
+            self._count('needs_review')
         
         # Log final results
-        self._log_result(f"Final confidence scores - Authors: {result['author_confidence']}%, Abstract: {result['abstract_confidence']}%, Webpage: {result['webpage_confidence']}%")
+        self._log_result(f"Final confidence scores - Authors: {result['author_confidence']}%, Abstract: {result['abstract_confidence']}%, Webpage: {result['webpage_confidence']}%", log)
         if result['errors']:
-            self._log_result(f"Errors: {'; '.join(result['errors'])}")
+            self._log_result(f"Errors: {'; '.join(result['errors'])}", log)
         
         # Build enriched block
-        enriched_block = block.strip()
+        parts = [block.strip()]
         
         if result['authors']:
-            enriched_block += f"\nAuthors: {result['authors']}"
-            enriched_block += f"\nAuthor_Confidence: {result['author_confidence']}%"
+            parts.append(f"Authors: {result['authors']}")
+            parts.append(f"Author_Confidence: {result['author_confidence']}%")
         
         if result['abstract']:
-            enriched_block += f"\nAbstract: {result['abstract']}"
-            enriched_block += f"\nAbstract_Confidence: {result['abstract_confidence']}%"
+            parts.append(f"Abstract: {result['abstract']}")
+            parts.append(f"Abstract_Confidence: {result['abstract_confidence']}%")
         
         if result['webpage']:
-            enriched_block += f"\nWebpage: {result['webpage']}"
-            enriched_block += f"\nWebpage_Confidence: {result['webpage_confidence']}%"
+            parts.append(f"Webpage: {result['webpage']}")
+            parts.append(f"Webpage_Confidence: {result['webpage_confidence']}%")
         
-        enriched_block += f"\nSource_Method: {result['source_method']}"
-        enriched_block += f"\nNeeds_Review: {result['needs_review']}"
+        parts.append(f"Source_Method: {result['source_method']}")
+        parts.append(f"Needs_Review: {result['needs_review']}")
         
         if result['errors']:
-            enriched_block += f"\nErrors: {'; '.join(result['errors'])}"
+            parts.append(f"Errors: {'; '.join(result['errors'])}")
         
-        return enriched_block
+        return "\n".join(parts)
     
-    def enrich(self, input_file, output_file, delay=1.0):
-        """Enrich references with additional metadata"""
+    def enrich(self, input_file, output_file, delay=1.0, workers=8, use_cache=True):
+        """Enrich references with additional metadata
+        
+        Papers are processed concurrently on `workers` threads; `delay` is
+        the minimum time between two requests to the same host. With
+        use_cache, DOI resolutions and page metadata are kept in
+        .enrich_cache.sqlite next to the output file and reused by later runs.
+        """
         input_path = Path(input_file)
         output_path = Path(output_file)
         
@@ -332,6 +683,7 @@ class MetadataEnricher:
         
         # Initialize results log
         self.results_log = [f"PROCESSING STARTED: {datetime.now()}", "="*80, ""]
+        self.stats = Counter()
         self._log_result("Starting to enrich references with DOI-first approach...")
         
         # Read the input file
@@ -343,15 +695,22 @@ class MetadataEnricher:
         
         # Split into paper blocks
         blocks = [block for block in content.split('\n\n') if block.strip()]
-        enriched_blocks = []
         
         self._log_result(f"Found {len(blocks)} papers to process")
         
-        for i, block in enumerate(blocks):
-            self._log_result(f"\n[{i+1}/{len(blocks)}] " + "="*50)
-            enriched_block = self._process_paper_block(block)
-            enriched_blocks.append(enriched_block)
-            time.sleep(delay)
+        # Papers spend nearly all their time waiting on the network, so overlap
+        # them; the session keeps each host's requests `delay` apart
+        self.session.delay = delay
+        cache = EnrichmentCache(output_path.parent / '.enrich_cache.sqlite') if use_cache else None
+        self.crossref_resolver.cache = self.doi_resolver.cache = self.metadata_extractor.cache = cache
+        process = partial(self._enrich_block, total=len(blocks))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                enriched_blocks = list(executor.map(process, range(1, len(blocks) + 1), blocks))
+        finally:
+            if cache:
+                cache.close()
+            self.crossref_resolver.cache = self.doi_resolver.cache = self.metadata_extractor.cache = None
         
         # Write enriched output
         try:
@@ -374,41 +733,36 @@ class MetadataEnricher:
         self.logger.info(f"Enriched {len(blocks)} papers, results saved to {output_path}")
         
         # Automatically analyze results
-        self._analyze_results(log_file)
+        self._analyze_results()
         
         return len(blocks)
     
-    def _analyze_results(self, results_file):
-        """Analyze processing results from log file"""
-        try:
-            with open(results_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            self.logger.error(f"Failed to read results file: {e}")
-            return
-        
-        # Count statistics
-        total_papers = len(re.findall(r'\[\d+/\d+\]', content))
-        doi_attempts = len(re.findall(r'Attempting DOI resolution', content))
-        doi_successes = len(re.findall(r'DOI resolved to:', content))
-        doi_failures = len(re.findall(r'DOI resolution failed:', content))
+    def _analyze_results(self):
+        """Print the statistics gathered while processing"""
+        stats = self.stats
+        total_papers = stats['papers']
+        crossref_attempts = stats['crossref_attempts']
+        crossref_successes = stats['crossref_successes']
+        doi_attempts = stats['doi_attempts']
+        doi_successes = stats['doi_successes']
+        doi_failures = stats['doi_failures']
         
-        fallback_attempts = len(re.findall(r'Falling back to Google search', content))
-        fallback_successes = len(re.findall(r'Fallback extraction successful', content))
+        fallback_attempts = stats['fallback_attempts']
+        fallback_successes = stats['fallback_successes']
         
-        no_results = len(re.findall(r'No search results found', content))
+        no_results = stats['no_results']
         
-        # Confidence levels
-        high_conf_90 = len(re.findall(r'confidence: 90%', content))
-        med_conf_70 = len(re.findall(r'confidence: 70%', content))
-        med_conf_60 = len(re.findall(r'confidence: 60%', content))
-        zero_conf = len(re.findall(r'confidence: 0%', content))
+        # Confidence levels (counted per field, two fields per paper)
+        high_conf_90 = stats['conf_90']
+        med_conf_70 = stats['conf_70']
+        med_conf_60 = stats['conf_60']
+        zero_conf = stats['conf_0']
         
-        needs_review = len(re.findall(r'\[REVIEW NEEDED\]', content))
+        needs_review = stats['needs_review']
         
         # Error types
-        http_403 = len(re.findall(r'HTTP 403', content))
-        http_202 = len(re.findall(r'HTTP 202', content))
+        http_403 = stats['http_403']
+        http_202 = stats['http_202']
         
         # Print analysis
         print(f"\nCOMPLETE PROCESSING STATISTICS FOR ALL {total_papers} PAPERS")
@@ -416,6 +770,12 @@ class MetadataEnricher:
         print(f"Total papers processed: {total_papers}")
         print()
         
+        if crossref_attempts > 0:
+            print("CROSSREF LOOKUP:")
+            print(f"  Crossref attempts: {crossref_attempts}")
+            print(f"  Crossref successes: {crossref_successes} ({crossref_successes/crossref_attempts*100:.1f}%)")
+            print()
+        
         if doi_attempts > 0:
             print("DOI RESOLUTION:")
             print(f"  DOI attempts: {doi_attempts}")
@@ -1,6 +1,17 @@
 import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import fitz  # PyMuPDF
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF before 1.24.3 only installs the fitz name
+    import fitz as pymupdf
+
+from commands.file_utils import iter_files
+
+def _highlight_one(input_file, output_file):
+    """Worker entry point: make one highlightable copy"""
+    return PDFAnnotator().make_highlightable(input_file, output_file)
 
 class PDFAnnotator:
     def __init__(self):
@@ -21,9 +32,14 @@ class PDFAnnotator:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            doc = fitz.open(str(input_path))
-            doc.save(str(output_path), garbage=4, deflate=True)
-            doc.close()
+            with pymupdf.open(str(input_path)) as doc:
+                if self._allows_annotations(doc):
+                    # Nothing to unlock or repair, so a byte copy is enough
+                    shutil.copyfile(input_path, output_path)
+                else:
+                    # garbage=2 compacts the xref without the costly duplicate-object search of 4
+                    doc.save(str(output_path), garbage=2, deflate=True, deflate_images=True,
+                             deflate_fonts=True, clean=True)
             
             self.logger.info(f"Highlightable PDF created: {output_path}")
             return True
@@ -32,7 +48,11 @@ class PDFAnnotator:
             self.logger.error(f"Failed to create highlightable PDF: {e}")
             return False
     
-    def process(self, input_path, output_dir):
+    def _allows_annotations(self, doc):
+        """True if the PDF opened cleanly and its permissions already allow annotating"""
+        return not doc.needs_pass and not doc.is_repaired and bool(doc.permissions & pymupdf.PDF_PERM_ANNOTATE)
+    
+    def process(self, input_path, output_dir, workers=None):
         """Process PDF file(s) to make them highlightable"""
         input_path = Path(input_path)
         output_dir = Path(output_dir)
@@ -52,7 +72,7 @@ class PDFAnnotator:
             return success
         
         elif input_path.is_dir():
-            pdf_files = list(input_path.rglob('*.pdf'))
+            pdf_files = [Path(path) for path in iter_files(input_path, '.pdf', ignore_case=True)]
             
             if not pdf_files:
                 self.logger.warning(f"No PDF files found in {input_path}")
@@ -60,15 +80,23 @@ class PDFAnnotator:
             
             self.logger.info(f"Found {len(pdf_files)} PDF files to process")
             
-            success_count = 0
+            output_files = []
             for pdf_file in pdf_files:
                 # Maintain relative structure
                 relative_path = pdf_file.relative_to(input_path)
-                output_file = output_dir / relative_path.parent / f"{pdf_file.stem}_highlightable.pdf"
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                if self.make_highlightable(pdf_file, output_file):
-                    success_count += 1
+                output_files.append(output_dir / relative_path.parent / f"{pdf_file.stem}_highlightable.pdf")
+            
+            # Many files share a folder; create each one once
+            for folder in {output_file.parent for output_file in output_files}:
+                folder.mkdir(parents=True, exist_ok=True)
+            
+            if workers == 1 or len(pdf_files) < 2:
+                results = map(self.make_highlightable, pdf_files, output_files)
+            else:
+                # MuPDF is not thread-safe, so files are spread over processes
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_highlight_one, pdf_files, output_files))
+            success_count = sum(1 for ok in results if ok)
             
             self.logger.info(f"Successfully processed {success_count}/{len(pdf_files)} PDF files")
             return success_count == len(pdf_files)
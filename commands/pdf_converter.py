@@ -1,54 +1,277 @@
+import hashlib
+import json
 import logging
+import os
+import re
 import shutil
+import stat
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from itertools import repeat
 from pathlib import Path
-import PyPDF2
-import pdfplumber
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF before 1.24.3 only installs the fitz name
+    import fitz as pymupdf
+
+try:
+    import pypdfium2 as pdfium  # optional: PDFium engine, second opinion when MuPDF fails
+except ImportError:
+    pdfium = None
+
+from commands.file_utils import iter_files, open_mapped, read_ahead, read_bytes
+
+# Documents with more pages than this are split across processes by page range
+PARALLEL_PAGE_THRESHOLD = 200
+# Maps content digests of converted PDFs to their text output, relative to the output directory
+HASH_INDEX_NAME = '.hash_index.json'
+# Single output of a folder converted with jsonl=True, one {"name", "text"} record per PDF
+CORPUS_NAME = 'corpus.jsonl'
+# Folder conversions log one progress line per this many files; per-file messages are debug
+PROGRESS_INTERVAL = 100
+# Runs of spaces/tabs left by column layouts and justified text
+_HSPACE_RE = re.compile(r'[ \t]{2,}|\t')
+
+def _write_text(output_path, text):
+    """Write text as UTF-8 via a temporary file so a crash never leaves a partial output
+    
+    Existing outputs are skipped on the next run, so they must be complete.
+    """
+    tmp_path = output_path.with_suffix('.txt.tmp')
+    tmp_path.write_bytes(text.encode('utf-8'))
+    os.replace(tmp_path, output_path)
+
+def _normalize(text):
+    """Collapse runs of spaces and tabs into one space, in a single regex pass"""
+    return _HSPACE_RE.sub(' ', text)
+
+def _copy_text(source_path, output_path):
+    """Copy an earlier conversion into place, atomically like _write_text"""
+    tmp_path = output_path.with_suffix('.txt.tmp')
+    shutil.copyfile(source_path, tmp_path)
+    os.replace(tmp_path, output_path)
+
+def _remove_tree(path):
+    """Delete a directory tree, with one `rm -rf` process on Linux instead of a Python-level walk
+    
+    Falls back to shutil.rmtree elsewhere, or if rm fails, so errors surface as OSError.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            subprocess.run(['rm', '-rf', '--', os.fspath(path)], check=True, stderr=subprocess.DEVNULL)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    shutil.rmtree(path)
+
+def _digest(data):
+    """BLAKE2b digest of a file's bytes, as keyed in the hash index"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+# Digest -> path of an earlier text output, copied into worker processes at startup
+_known_outputs = {}
+
+def _set_known_outputs(known):
+    """Worker initializer: receive the parent's digest -> output map once per process"""
+    global _known_outputs
+    _known_outputs = known
+
+def _extract_page_range(pdf_path, start, stop):
+    """Worker entry point: text of pages [start, stop) of one PDF"""
+    with pymupdf.open(str(pdf_path)) as doc:
+        return "\n".join(doc[number].get_text("text") for number in range(start, stop))
+
+def _open_pymupdf(pdf_path, data=None):
+    """Open a PDF with PyMuPDF from already-read bytes if given, else from its path"""
+    if data is not None:
+        return pymupdf.open(stream=data, filetype='pdf')
+    return pymupdf.open(str(pdf_path))
+
+def _convert_one(pdf_path, output_path, data=None, known=None):
+    """Worker entry point: convert one PDF and return (name, ok, error, digest, reused)
+    
+    Only plain paths cross the process boundary; each call builds its own
+    converter, without page parallelism since files already run in parallel.
+    The file is read once, for both its digest and the parse. When known
+    (default: the map set by _set_known_outputs) has an output for the
+    digest, that text is copied instead of converting again.
+    """
+    digest = None
+    try:
+        if data is None:
+            data = read_bytes(pdf_path)
+        digest = _digest(data)
+        source = (_known_outputs if known is None else known).get(digest)
+        if source and source != os.fspath(output_path) and os.path.isfile(source):
+            _copy_text(source, output_path)
+            return pdf_path.name, True, None, digest, True
+        
+        text = PDFConverter(page_workers=1).convert_pdf_to_text(pdf_path, data)
+        _write_text(output_path, text)
+        return pdf_path.name, True, None, digest, False
+    except Exception as e:
+        return pdf_path.name, False, str(e), digest, False
+
+def _extract_one(pdf_path, output_path=None, data=None):
+    """Worker entry point: return (name, text, error) for one PDF without writing any file"""
+    try:
+        return pdf_path.name, PDFConverter(page_workers=1).convert_pdf_to_text(pdf_path, data), None
+    except Exception as e:
+        return pdf_path.name, None, str(e)
 
 class PDFConverter:
-    def __init__(self):
+    def __init__(self, page_workers=None):
         self.logger = logging.getLogger(__name__)
         self.conversion_errors = []
+        self.hash_index = {}
+        self._made_dirs = set()
+        # Processes used for one large PDF (None: CPU count, 1: never split)
+        self.page_workers = page_workers
+    
+    def _choose_strategy(self, doc):
+        """Pick 'pymupdf' (in-process) or 'pymupdf_mp' (page ranges in processes) for an open document"""
+        workers = self.page_workers or os.cpu_count() or 1
+        if workers > 1 and doc.page_count > PARALLEL_PAGE_THRESHOLD:
+            return 'pymupdf_mp'
+        return 'pymupdf'
+    
+    def extract_text_pymupdf(self, pdf_path, data=None):
+        """Extract text using PyMuPDF (from data, the file's bytes, when given)"""
+        try:
+            # Open once: the same document answers the strategy question and, usually, the extraction
+            with _open_pymupdf(pdf_path, data) as doc:
+                if self._choose_strategy(doc) == 'pymupdf':
+                    return "\n".join(page.get_text("text") for page in doc).strip()
+                page_count = doc.page_count
+            return self.extract_text_pymupdf_parallel(pdf_path, page_count)
+        except Exception as e:
+            raise Exception(f"PyMuPDF extraction failed: {str(e)}")
+    
+    def extract_text_pymupdf_parallel(self, pdf_path, page_count):
+        """Extract text with PyMuPDF, each worker process reopening the file for one page range"""
+        workers = self.page_workers or os.cpu_count() or 1
+        pages_per_segment = -(-page_count // workers)
+        starts = range(0, page_count, pages_per_segment)
+        stops = [min(start + pages_per_segment, page_count) for start in starts]
+        
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            segments = executor.map(_extract_page_range, repeat(pdf_path), starts, stops)
+            return "\n".join(segments).strip()
+    
+    def extract_text_pdfium(self, pdf_path):
+        """Extract text using pypdfium2
+        
+        PDFium is not thread-safe either, so this runs in the same
+        process-per-file model as the other extractors.
+        """
+        try:
+            pdf = pdfium.PdfDocument(str(pdf_path))
+            try:
+                parts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium ends lines with CRLF; the other extractors use LF
+                    parts.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+                return "\n".join(parts).strip()
+            finally:
+                pdf.close()
+        except Exception as e:
+            raise Exception(f"pypdfium2 extraction failed: {str(e)}")
     
     def extract_text_pypdf2(self, pdf_path):
         """Extract text using PyPDF2"""
+        # Imported on first use: only needed when the faster engines fail
+        import PyPDF2
+        
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+            # PdfReader seeks around the file (xref, trailer, objects); a mapping
+            # serves those reads from memory without buffered-I/O syscalls
+            with open_mapped(pdf_path) as data:
+                if not data:
+                    raise ValueError("Cannot read an empty file")
+                reader = PyPDF2.PdfReader(data)
+                return "\n".join(page.extract_text() for page in reader.pages).strip()
         except Exception as e:
             raise Exception(f"PyPDF2 extraction failed: {str(e)}")
     
     def extract_text_pdfplumber(self, pdf_path):
         """Extract text using pdfplumber"""
+        # Imported on first use: pdfplumber pulls in pdfminer.six, slow to load
+        import pdfplumber
+        
         try:
-            text = ""
+            parts = []
             with pdfplumber.open(pdf_path) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
+                    # Free the page's parsed layout now rather than when the whole PDF closes
+                    page.close()
                     if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+                        parts.append(page_text)
+            return "\n".join(parts).strip()
         except Exception as e:
             raise Exception(f"pdfplumber extraction failed: {str(e)}")
     
-    def convert_pdf_to_text(self, pdf_path):
-        """Convert a single PDF to text using multiple methods"""
-        # Try pdfplumber first
+    def _has_text_objects(self, pdf_path, data=None):
+        """False if no page holds a text block, i.e. a scanned, image-only PDF
+        
+        Every page is checked, since scanned covers often precede real text.
+        Unreadable files count as having text so the extractors report the real error.
+        """
+        try:
+            with _open_pymupdf(pdf_path, data) as doc:
+                for page in doc:
+                    # Block tuples end with the block type: 0 = text, 1 = image
+                    if any(block[6] == 0 for block in page.get_text("blocks")):
+                        return True
+                return doc.page_count == 0
+        except Exception:
+            return True
+    
+    def convert_pdf_to_text(self, pdf_path, data=None):
+        """Convert a single PDF to text using multiple methods
+        
+        data optionally holds the file's bytes, already read; the PyMuPDF
+        steps then parse it from memory (the fallbacks reopen the path).
+        """
+        # Try PyMuPDF first, its C extractor is much faster than the others
+        try:
+            text = self.extract_text_pymupdf(pdf_path, data)
+            if text and len(text) > 100:
+                return _normalize(text)
+        except Exception as e:
+            self.logger.debug(f"PyMuPDF failed for {pdf_path.name}: {e}")
+        
+        # The fallbacks would come back empty too on a scan; don't run them all
+        if not self._has_text_objects(pdf_path, data):
+            raise Exception("No text layer found (image-only PDF, needs OCR)")
+        
+        # Fallback to PDFium when installed, still a C engine
+        if pdfium is not None:
+            try:
+                text = self.extract_text_pdfium(pdf_path)
+                if text and len(text) > 100:
+                    return _normalize(text)
+            except Exception as e:
+                self.logger.debug(f"pypdfium2 failed for {pdf_path.name}: {e}")
+        
+        # Fallback to pdfplumber
         try:
             text = self.extract_text_pdfplumber(pdf_path)
-            if text and len(text.strip()) > 100:
-                return text
+            if text and len(text) > 100:
+                return _normalize(text)
         except Exception as e:
             self.logger.debug(f"pdfplumber failed for {pdf_path.name}: {e}")
         
         # Fallback to PyPDF2
         try:
             text = self.extract_text_pypdf2(pdf_path)
-            if text and len(text.strip()) > 100:
-                return text
+            if text and len(text) > 100:
+                return _normalize(text)
         except Exception as e:
             self.logger.debug(f"PyPDF2 failed for {pdf_path.name}: {e}")
         
@@ -66,14 +289,20 @@ class PDFConverter:
             # Single file processing
             output_dir_final = output_base / "single_files"
         
-        output_dir_final.mkdir(parents=True, exist_ok=True)
+        # A folder's files all share one output directory; create it once
+        if output_dir_final not in self._made_dirs:
+            output_dir_final.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(output_dir_final)
         return output_dir_final / f"{pdf_path.stem}.txt"
     
     def convert_single_file(self, pdf_path, output_dir):
         """Convert a single PDF file"""
         pdf_path = Path(pdf_path)
         
-        if not pdf_path.exists():
+        # One stat call answers the existence check; the parsers open the file later anyway
+        try:
+            os.stat(pdf_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         if pdf_path.suffix.lower() != '.pdf':
@@ -82,16 +311,26 @@ class PDFConverter:
         output_path = self.get_output_path(pdf_path, output_dir)
         
         # Skip if already converted
-        if output_path.exists():
+        try:
+            os.stat(output_path, follow_symlinks=False)
+        except FileNotFoundError:
+            pass
+        else:
             self.logger.info(f"Skipping {pdf_path.name} - already converted")
             return True
         
         try:
-            self.logger.info(f"Converting {pdf_path.name}...")
-            text = self.convert_pdf_to_text(pdf_path)
+            # One read serves both the digest and the parse
+            data = read_bytes(pdf_path)
+            digest = _digest(data)
+            if self._reuse_conversion(digest, output_path, output_dir):
+                self.logger.info(f"Reused earlier conversion of identical file: {pdf_path.name}")
+                return True
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            self.logger.info(f"Converting {pdf_path.name}...")
+            text = self.convert_pdf_to_text(pdf_path, data)
+            _write_text(output_path, text)
+            self._remember_conversion(digest, output_path, output_dir)
             
             self.logger.info(f"Converted: {pdf_path.name} -> {output_path}")
             return True
@@ -102,17 +341,23 @@ class PDFConverter:
             self.conversion_errors.append(error_msg)
             return False
     
-    def convert_folder(self, folder_path, output_dir):
-        """Convert all PDFs in a folder"""
+    def convert_folder(self, folder_path, output_dir, workers=None, jsonl=False):
+        """Convert all PDFs in a folder, using worker processes unless workers=1
+        
+        With jsonl=True all texts go to one output_dir/corpus.jsonl instead
+        of a .txt per PDF.
+        """
         folder_path = Path(folder_path)
         
-        if not folder_path.exists():
+        try:
+            folder_stat = os.stat(folder_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Folder not found: {folder_path}")
         
-        if not folder_path.is_dir():
+        if not stat.S_ISDIR(folder_stat.st_mode):
             raise ValueError(f"Path is not a directory: {folder_path}")
         
-        pdf_files = list(folder_path.glob("*.pdf"))
+        pdf_files = [Path(path) for path in iter_files(folder_path, '.pdf', recursive=False, ignore_case=True)]
         
         if not pdf_files:
             self.logger.warning(f"No PDF files found in {folder_path}")
@@ -120,52 +365,174 @@ class PDFConverter:
         
         self.logger.info(f"Found {len(pdf_files)} PDF files in {folder_path}")
         
+        if jsonl:
+            return self._convert_folder_jsonl(pdf_files, folder_path, output_dir, workers)
+        
+        # One listing of the output folder instead of an exists() check per file
+        output_folder = self.get_output_path(pdf_files[0], output_dir, folder_path).parent
+        with os.scandir(output_folder) as entries:
+            completed = {entry.name for entry in entries if entry.is_file()}
+        
         success_count = 0
+        pending = []
         for pdf_file in pdf_files:
             output_path = self.get_output_path(pdf_file, output_dir, folder_path)
             
             # Skip if already converted
-            if output_path.exists():
-                self.logger.info(f"Skipping {pdf_file.name} - already converted")
+            if output_path.name in completed:
+                self.logger.debug(f"Skipping {pdf_file.name} - already converted")
                 success_count += 1
                 continue
-            
-            try:
-                self.logger.info(f"Converting {pdf_file.name}...")
-                text = self.convert_pdf_to_text(pdf_file)
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                
-                self.logger.info(f"Converted: {pdf_file.name}")
-                success_count += 1
-                
-            except Exception as e:
-                error_msg = f"Failed to convert {pdf_file.name}: {str(e)}"
+            pending.append((pdf_file, output_path))
+        
+        # Identical bytes under another name reuse an earlier text. The workers
+        # hash each file from the bytes they read anyway, so nothing is read
+        # twice; the serial path also sees conversions made earlier in this run.
+        known = {digest: os.path.join(output_dir, relative) for digest, relative in self.hash_index.items()}
+        output_paths = {pdf_file.name: output_path for pdf_file, output_path in pending}
+        done = len(pdf_files) - len(pending)
+        for name, ok, error, digest, reused in self._run_conversions(pending, workers, known=known):
+            done = self._log_progress(done, 1, len(pdf_files))
+            if not ok:
+                error_msg = f"Failed to convert {name}: {error}"
                 self.logger.error(error_msg)
                 self.conversion_errors.append(error_msg)
+                continue
+            
+            success_count += 1
+            if reused:
+                self.logger.debug(f"Reused earlier conversion of identical file: {name}")
+                continue
+            self.logger.debug(f"Converted: {name}")
+            self._remember_conversion(digest, output_paths[name], output_dir)
+            known.setdefault(digest, os.fspath(output_paths[name]))
         
         self.logger.info(f"Converted {success_count}/{len(pdf_files)} files from {folder_path}")
         return success_count == len(pdf_files)
     
-    def convert(self, input_path, output_dir, clean=False):
-        """Convert PDF(s) to text"""
+    def _convert_folder_jsonl(self, pdf_files, folder_path, output_dir, workers):
+        """Write the text of every PDF as one record of output_dir/corpus.jsonl
+        
+        One long-lived, generously buffered handle replaces an open/write/close
+        per file. The corpus is rewritten on every run and records follow
+        completion order.
+        """
+        corpus_path = Path(output_dir) / CORPUS_NAME
+        done = 0
+        success_count = 0
+        try:
+            with open(corpus_path, 'wb', buffering=1 << 20) as f:
+                results = self._run_conversions([(pdf_file, None) for pdf_file in pdf_files], workers, _extract_one)
+                for name, text, error in results:
+                    done = self._log_progress(done, 1, len(pdf_files))
+                    if not error:
+                        # Encode here so text that is not valid UTF-8 (e.g. a lone
+                        # surrogate) fails this file only, as _write_text does
+                        try:
+                            record = (json.dumps({"name": name, "text": text}, ensure_ascii=False)
+                                      + "\n").encode('utf-8')
+                        except UnicodeEncodeError as e:
+                            error = str(e)
+                    if error:
+                        error_msg = f"Failed to convert {name}: {error}"
+                        self.logger.error(error_msg)
+                        self.conversion_errors.append(error_msg)
+                        continue
+                    
+                    self.logger.debug(f"Converted: {name}")
+                    f.write(record)
+                    success_count += 1
+        except OSError as e:
+            raise IOError(f"Failed to write output file: {e}")
+        
+        self.logger.info(f"Converted {success_count}/{len(pdf_files)} files from {folder_path} into {corpus_path}")
+        return success_count == len(pdf_files)
+    
+    def _log_progress(self, done, count, total):
+        """Add count finished files to done, logging each PROGRESS_INTERVAL boundary crossed"""
+        if (done + count) // PROGRESS_INTERVAL > done // PROGRESS_INTERVAL:
+            self.logger.info(f"Processed {done + count}/{total} files")
+        return done + count
+    
+    def _reuse_conversion(self, digest, output_path, output_dir):
+        """Copy the text of an earlier conversion of identical bytes to output_path, if any"""
+        known = self.hash_index.get(digest)
+        if not known:
+            return False
+        source_path = Path(output_dir) / known
+        if source_path == output_path or not source_path.is_file():
+            return False
+        _copy_text(source_path, output_path)
+        return True
+    
+    def _remember_conversion(self, digest, output_path, output_dir):
+        self.hash_index[digest] = os.path.relpath(output_path, output_dir)
+    
+    def _load_hash_index(self, output_dir):
+        try:
+            with open(Path(output_dir) / HASH_INDEX_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_hash_index(self, output_dir):
+        try:
+            _write_text(Path(output_dir) / HASH_INDEX_NAME, json.dumps(self.hash_index))
+        except OSError as e:
+            self.logger.warning(f"Failed to save hash index: {e}")
+    
+    def _run_conversions(self, pending, workers, task=_convert_one, known=None):
+        """Yield task's result tuple for each (pdf_path, output_path) as it finishes
+        
+        known is the digest -> output map for _convert_one: the serial path
+        passes the live dict, worker processes get a copy when they start.
+        """
+        if workers == 1 or len(pending) < 2:
+            if known is not None:
+                task = partial(task, known=known)
+            # Background threads read the next few files while this one is parsed
+            output_paths = dict(pending)
+            for pdf_file, future in read_ahead(output_paths, window=8, max_workers=2):
+                try:
+                    data = future.result()
+                except OSError:
+                    data = None  # the task reads the file again and reports the error
+                self.logger.debug(f"Converting {pdf_file.name}...")
+                yield task(pdf_file, output_paths[pdf_file], data)
+            return
+        
+        # Extraction is CPU-bound and MuPDF is not thread-safe, so spread files
+        # over processes, leaving one core for the parent and the OS by default
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_known_outputs,
+                                 initargs=(known or {},)) as executor:
+            futures = [executor.submit(task, pdf_file, output_path)
+                       for pdf_file, output_path in pending]
+            for future in as_completed(futures):
+                yield future.result()
+    
+    def convert(self, input_path, output_dir, clean=False, workers=None, jsonl=False):
+        """Convert PDF(s) to text (jsonl applies to folders, see convert_folder)"""
         input_path = Path(input_path)
         output_dir = Path(output_dir)
         
         if clean and output_dir.exists():
-            shutil.rmtree(output_dir)
+            _remove_tree(output_dir)
+            self._made_dirs.clear()
             self.logger.info(f"Cleaned output directory: {output_dir}")
         
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
+        self.hash_index = self._load_hash_index(output_dir)
         
         if input_path.is_file():
             success = self.convert_single_file(input_path, output_dir)
         elif input_path.is_dir():
-            success = self.convert_folder(input_path, output_dir)
+            success = self.convert_folder(input_path, output_dir, workers, jsonl)
         else:
             raise ValueError(f"Input path is neither file nor directory: {input_path}")
+        self._save_hash_index(output_dir)
         
         if self.conversion_errors:
             self.logger.warning(f"{len(self.conversion_errors)} conversion errors occurred")